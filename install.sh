@@ -1,4 +1,4 @@
 #!/bin/bash
 uv venv
 source .venv/bin/activate  # On Windows: .venv\Scripts\activate
-uv pip install web3 eth-utils requests
\ No newline at end of file
+uv pip install "web3>=7" eth-utils requests
\ No newline at end of file
@@ -1,13 +1,12 @@
 #!/usr/bin/env python3
 
 from web3 import Web3
+from web3.exceptions import BadFunctionCallOutput, ContractLogicError, Web3Exception
 import json
 import os
 from getpass import getpass
 from eth_account import account
 import sys
-import math
-from eth_utils import keccak
 import requests
 from pathlib import Path
 import time
@@ -41,10 +40,35 @@ def account_load(fname):
 
 # Setup web3
 w3 = Web3(Web3.HTTPProvider(RPC))
-if not w3.is_connected():
-    raise ConnectionError(f"Failed to connect to RPC: {RPC}")
-
-chain_id = w3.eth.chain_id
+# Fetching chain_id doubles as the connection check, saving a round trip
+try:
+    chain_id = w3.eth.chain_id
+except Exception as e:
+    raise ConnectionError(f"Failed to connect to RPC: {RPC}") from e
+
+# Set to False after the first failed batch so later calls skip straight to
+# single requests instead of retrying and warning every time.
+batch_supported = True
+
+def batch_call(calls):
+    # Send several contract calls as one JSON-RPC batch (one HTTP round trip).
+    # Needs web3 >= 7. Falls back to one request per call if the RPC rejects
+    # batch requests, either with a JSON-RPC error or an HTTP error status.
+    # Reverts and undecodable results are raised as-is, not retried.
+    global batch_supported
+    if not batch_supported:
+        return [call.call() for call in calls]
+    try:
+        with w3.batch_requests() as batch:
+            for call in calls:
+                batch.add(call)
+            return batch.execute()
+    except (ContractLogicError, BadFunctionCallOutput):
+        raise
+    except (Web3Exception, requests.exceptions.HTTPError) as e:
+        batch_supported = False
+        print(f"Warning: batch request failed, using single calls: {e}")
+        return [call.call() for call in calls]
 
 def get_abi_from_etherscan(address):
 
@@ -115,7 +139,12 @@ fxswap_contract = w3.eth.contract(
     abi=fxswap_abi
 )
 
-pool_name = fxswap_contract.functions.name().call()
+# Get pool name and token addresses in one batch
+pool_name, token0_address, token1_address = batch_call([
+    fxswap_contract.functions.name(),
+    fxswap_contract.functions.coins(0),
+    fxswap_contract.functions.coins(1),
+])
 print(f"Pool name: {pool_name}")
 
 # Standard ERC20 ABI for getting token info
@@ -150,10 +179,6 @@ ERC20_ABI = [
     }
 ]
 
-# Get token addresses from pool
-token0_address = fxswap_contract.functions.coins(0).call()
-token1_address = fxswap_contract.functions.coins(1).call()
-
 print(f"Token 0 address: {token0_address}")
 print(f"Token 1 address: {token1_address}")
 
@@ -161,10 +186,26 @@ print(f"Token 1 address: {token1_address}")
 token0_contract = w3.eth.contract(address=Web3.to_checksum_address(token0_address), abi=ERC20_ABI)
 token1_contract = w3.eth.contract(address=Web3.to_checksum_address(token1_address), abi=ERC20_ABI)
 
-token0_name = token0_contract.functions.name().call()
-token0_decimals = token0_contract.functions.decimals().call()
-token1_name = token1_contract.functions.name().call()
-token1_decimals = token1_contract.functions.decimals().call()
+# Get token info and current pool state in one batch
+(
+    token0_name,
+    token0_decimals,
+    token1_name,
+    token1_decimals,
+    current_balance_0,
+    current_balance_1,
+    last_price,
+    current_total_supply,
+) = batch_call([
+    token0_contract.functions.name(),
+    token0_contract.functions.decimals(),
+    token1_contract.functions.name(),
+    token1_contract.functions.decimals(),
+    fxswap_contract.functions.balances(0),
+    fxswap_contract.functions.balances(1),
+    fxswap_contract.functions.last_prices(),
+    fxswap_contract.functions.totalSupply(),
+])
 
 print(f"Token 0: {token0_name} ({token0_decimals} decimals)")
 print(f"Token 1: {token1_name} ({token1_decimals} decimals)")
@@ -183,12 +224,7 @@ USD_ADDRESSES = [
 token0_is_usdc = token0_address.lower() in [addr.lower() for addr in USD_ADDRESSES]
 token1_is_usdc = token1_address.lower() in [addr.lower() for addr in USD_ADDRESSES]
 
-# Get current pool state
-current_balance_0 = fxswap_contract.functions.balances(0).call()
-current_balance_1 = fxswap_contract.functions.balances(1).call()
-
-# Get last_price from pool (price of token1 in terms of token0, scaled by 10^18)
-last_price = fxswap_contract.functions.last_prices().call()
+# last_price from pool is the price of token1 in terms of token0, scaled by 10^18
 price_ratio = last_price / 10**18  # Price of token1 in terms of token0
 
 # Get USD prices - calculate from last_price if one token is USDC, otherwise ask
@@ -239,7 +275,6 @@ else:
 
 # Calculate USD value of 1 LP token (10**18)
 one_lp_token = 10**18
-current_total_supply = fxswap_contract.functions.totalSupply().call()
 
 # Get current pool state (balances already retrieved above for price calculation)
 
@@ -389,16 +424,34 @@ print("Waiting for withdrawal transaction receipt...")
 withdraw_tx_receipt = w3.eth.wait_for_transaction_receipt(withdraw_tx_hash, timeout=300)
 if withdraw_tx_receipt.status == 1:
     print("✓ Withdrawal successful! Tokens received.")
-    print(f"Waiting 10 seconds before adding liquidity for refuel...")
-    time.sleep(10)
 else:
     print("✗ Withdrawal failed!")
     print(f"Transaction receipt: {withdraw_tx_receipt}")
     sys.exit(1)
 
-# Get actual token balances after withdrawal
-token0_balance_after = token0_contract.functions.balanceOf(signer.address).call()
-token1_balance_after = token1_contract.functions.balanceOf(signer.address).call()
+# Get actual token balances after withdrawal.
+# The RPC node may lag behind the receipt, so poll with exponential backoff
+# until every balance we expect to receive has moved, waiting at most 10 seconds.
+# A token whose expected amount rounded to 0 may not move at all, so it is skipped.
+# Plain single calls are used here: the withdrawal is already mined, so this
+# path should not depend on the RPC accepting batch requests.
+print("Waiting for token balances to update before adding liquidity for refuel...")
+delay = 0.5
+deadline = time.monotonic() + 10
+while True:
+    token0_balance_after = token0_contract.functions.balanceOf(signer.address).call()
+    token1_balance_after = token1_contract.functions.balanceOf(signer.address).call()
+    if (
+        (token0_amount == 0 or token0_balance_after > token0_balance_before)
+        and (token1_amount == 0 or token1_balance_after > token1_balance_before)
+    ):
+        break
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        print("Warning: token balances did not update within 10 seconds, using latest values")
+        break
+    time.sleep(min(delay, remaining))
+    delay *= 2
 
 # Calculate actual amounts received
 actual_token0_amount = token0_balance_after - token0_balance_before